@@ -9,66 +9,117 @@ Usage:
 
   2. With arguments (legacy):
      python notify.py <type> <message>
+
+  Set CLAUDE_NOTIFY_DAEMON=1 (macOS/Linux) to hand notifications to a
+  background daemon that keeps the backend loaded and folds bursts of
+  events arriving within a short window into a single notification.
 """
 
-import json
 import os
-import platform
 import sys
+from functools import lru_cache
 from pathlib import Path
 
+# Platform checks resolved once at import; avoids loading the platform module
+_IS_WIN = sys.platform == "win32"
+_IS_MAC = sys.platform == "darwin"
+_IS_LINUX = sys.platform.startswith("linux")
+
+# Headless Linux (SSH, containers, CI) has no notification daemon to talk to;
+# decide once so notify2 never blocks waiting on a DBus connection
+_NOTIFY_DISABLED = _IS_LINUX and not (
+    os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")
+)
+
+# Opt-in notification daemon (POSIX only; Windows already detaches its toasts)
+_DAEMON_ENV = "CLAUDE_NOTIFY_DAEMON"
+_DAEMON_ARG = "--daemon"
+_USE_DAEMON = not _IS_WIN and os.environ.get(_DAEMON_ENV) == "1"
+_DAEMON_COALESCE_SECONDS = 0.2
+_DAEMON_IDLE_SECONDS = 600
+
+_SCRIPT_DIR = Path(__file__).parent
+
 
+@lru_cache(maxsize=1)
 def get_icon_path():
-    """Get the absolute path to the notification icon"""
-    script_dir = Path(__file__).parent
-    icon_path = script_dir / "icon" / "claude-ai-icon.ico"
+    """Get the absolute path to the notification icon (cached after first lookup)"""
+    icon_path = _SCRIPT_DIR / "icon" / "claude-ai-icon.ico"
 
     if icon_path.exists():
         return str(icon_path)
 
     # Fallback: try PNG format
-    icon_path_png = script_dir / "icon" / "claude-ai-icon.png"
+    icon_path_png = _SCRIPT_DIR / "icon" / "claude-ai-icon.png"
     if icon_path_png.exists():
         return str(icon_path_png)
 
     return None
 
 
-# Import Windows notification library at module level with error handling
-_win10toast_available = False
+@lru_cache(maxsize=None)
+def _backend_available(module_name):
+    """Check once per process whether a notification backend is installed"""
+    import importlib.util
+    return importlib.util.find_spec(module_name) is not None
+
+
+# Windows notification library is imported lazily on first use
 _toast_notifier = None
 
-try:
-    from win10toast import ToastNotifier
-    _toast_notifier = ToastNotifier()
-    _win10toast_available = True
-except ImportError:
-    pass
-except Exception as e:
-    # win10toast has a known bug that throws TypeError on import
-    # If notification still works, we can ignore this
+# Substrings identifying win10toast's known (harmless) ctypes TypeError
+_W10_BUG_MARKERS = ("WPARAM", "LRESULT", "WNDPROC")
+
+
+def _is_win10toast_bug(e):
+    """Check whether an exception is the known win10toast WPARAM bug"""
     error_str = str(e)
-    if "WPARAM" in error_str or "LRESULT" in error_str or "WNDPROC" in error_str:
-        try:
-            from win10toast import ToastNotifier
-            _toast_notifier = ToastNotifier()
-            _win10toast_available = True
-        except:
-            pass
-    else:
-        print(f"[WARNING] win10toast import issue: {e}")
+    return any(marker in error_str for marker in _W10_BUG_MARKERS)
 
 
-def notify_windows(title, message, icon_path):
-    """Display notification on Windows using win10toast"""
-    if not _win10toast_available or _toast_notifier is None:
+def _get_toast_notifier():
+    """Import win10toast and create the notifier on first Windows call"""
+    global _toast_notifier
+    if _toast_notifier is not None:
+        return _toast_notifier
+
+    try:
+        from win10toast import ToastNotifier
+        _toast_notifier = ToastNotifier()
+    except ImportError:
+        pass
+    except Exception as e:
+        # win10toast has a known bug that throws TypeError on import
+        # If notification still works, we can ignore this
+        if _is_win10toast_bug(e):
+            try:
+                from win10toast import ToastNotifier
+                _toast_notifier = ToastNotifier()
+            except:
+                pass
+        else:
+            print(f"[WARNING] win10toast import issue: {e}")
+
+    return _toast_notifier
+
+
+# Hidden argument used to run the blocking toast in a detached child process
+_TOAST_CHILD_ARG = "--windows-toast"
+# The detached child has no console, so its output is appended here
+_TOAST_LOG_NAME = "cc-notify-toast.log"
+
+
+def _show_windows_toast(title, message, icon_path):
+    """Show a toast with win10toast, blocking for its display duration"""
+    toaster = _get_toast_notifier()
+    if toaster is None:
         print("[ERROR] win10toast not installed. Install with: pip install win10toast")
         return False
 
     try:
         # Display notification (duration in seconds)
         # Note: threaded=False to avoid TypeError with WPARAM
-        _toast_notifier.show_toast(
+        toaster.show_toast(
             title=title,
             msg=message,
             icon_path=icon_path,
@@ -79,16 +130,52 @@ def notify_windows(title, message, icon_path):
     except Exception as e:
         # win10toast has a known bug that throws TypeError even when notification succeeds
         # If the error message contains specific patterns, consider it a success
-        error_str = str(e)
-        if "WPARAM" in error_str or "LRESULT" in error_str or "WNDPROC" in error_str:
+        if _is_win10toast_bug(e):
             print(f"[WARNING] Ignoring known win10toast bug: {e}")
             return True
         print(f"[ERROR] Windows notification failed: {e}")
         return False
 
 
+def notify_windows(title, message, icon_path):
+    """Display notification on Windows using win10toast"""
+    if not _backend_available("win10toast"):
+        print("[ERROR] win10toast not installed. Install with: pip install win10toast")
+        return False
+
+    # show_toast() blocks for the whole display duration, so run it in a
+    # detached child process and let the hook return immediately
+    import subprocess
+    import tempfile
+
+    log_path = os.path.join(tempfile.gettempdir(), _TOAST_LOG_NAME)
+    env = dict(os.environ, PYTHONIOENCODING="utf-8")
+
+    try:
+        with open(log_path, "ab") as log_file:
+            subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), _TOAST_CHILD_ARG,
+                 title, message, icon_path or ""],
+                stdin=subprocess.DEVNULL,
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+                close_fds=True,
+                env=env,
+                creationflags=subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+            )
+        print(f"[INFO] Toast handed to background process; its output goes to {log_path}")
+        return True
+    except Exception as e:
+        print(f"[ERROR] Windows notification failed: {e}")
+        return False
+
+
 def notify_macos(title, message, icon_path):
     """Display notification on macOS using pync"""
+    if not _backend_available("pync"):
+        print("[ERROR] pync not installed. Install with: pip install pync")
+        return False
+
     try:
         import pync
 
@@ -110,11 +197,16 @@ def notify_macos(title, message, icon_path):
 
 def notify_linux(title, message, icon_path):
     """Display notification on Linux using notify2"""
+    if not _backend_available("notify2"):
+        print("[ERROR] notify2 not installed. Install with: pip install notify2")
+        return False
+
     try:
         import notify2
 
-        # Initialize notification system
-        notify2.init("Claude Code")
+        # Initialize notification system once; init() opens a DBus session
+        if not notify2.is_initted():
+            notify2.init("Claude Code")
 
         # Create notification
         notification = notify2.Notification(
@@ -137,6 +229,17 @@ def notify_linux(title, message, icon_path):
         return False
 
 
+# Map notification types to titles
+_DEFAULT_TITLE = "Claude Code"
+_TITLE_MAP = {
+    "stop": "Claude Code - Session Ending",
+    "permission": "Claude Code - Permission Required",
+    "error": "Claude Code - Error",
+    "warning": "Claude Code - Warning",
+    "info": "Claude Code - Information"
+}
+
+
 def show_notification(notification_type, message):
     """
     Main notification function that dispatches to platform-specific implementations
@@ -145,39 +248,47 @@ def show_notification(notification_type, message):
         notification_type: Type of notification (e.g., "stop", "permission", "error")
         message: The notification message text
     """
-    # Map notification types to titles
-    title_map = {
-        "stop": "Claude Code - Session Ending",
-        "permission": "Claude Code - Permission Required",
-        "error": "Claude Code - Error",
-        "warning": "Claude Code - Warning",
-        "info": "Claude Code - Information"
-    }
-
-    title = title_map.get(notification_type, "Claude Code")
-    icon_path = get_icon_path()
+    if _NOTIFY_DISABLED:
+        print("[INFO] No display available, skipping notification")
+        return True
+
+    if _USE_DAEMON and _daemon_socket_path():
+        status = _send_to_daemon(notification_type, message)
+        if status == "sent":
+            print("[INFO] Sent to notification daemon")
+            return True
+        if status == "absent":
+            # No daemon listening yet: start one for later hooks
+            _spawn_daemon()
+        # Show this one directly
 
-    # Detect platform and call appropriate notification function
-    system = platform.system()
+    title = _TITLE_MAP.get(notification_type, _DEFAULT_TITLE)
+    icon_path = get_icon_path()
 
-    print(f"[INFO] Platform: {system}")
-    print(f"[INFO] Title: {title}")
-    print(f"[INFO] Message: {message}")
-    print(f"[INFO] Icon: {icon_path if icon_path else 'System default'}")
+    sys.stdout.write(
+        f"[INFO] Platform: {sys.platform}\n"
+        f"[INFO] Title: {title}\n"
+        f"[INFO] Message: {message}\n"
+        f"[INFO] Icon: {icon_path if icon_path else 'System default'}\n"
+    )
 
     success = False
 
-    if system == "Windows":
+    # Call the notification function for the detected platform
+    if _IS_WIN:
         success = notify_windows(title, message, icon_path)
-    elif system == "Darwin":  # macOS
+    elif _IS_MAC:
         success = notify_macos(title, message, icon_path)
-    elif system == "Linux":
+    elif _IS_LINUX:
         success = notify_linux(title, message, icon_path)
     else:
-        print(f"[ERROR] Unsupported platform: {system}")
+        print(f"[ERROR] Unsupported platform: {sys.platform}")
         return False
 
-    if success:
+    if success and _IS_WIN:
+        # The toast itself is shown by the detached child process
+        print("[SUCCESS] Notification dispatched")
+    elif success:
         print("[SUCCESS] Notification displayed")
     else:
         print("[FAILED] Notification could not be displayed")
@@ -185,21 +296,398 @@ def show_notification(notification_type, message):
     return success
 
 
+@lru_cache(maxsize=1)
+def _daemon_socket_path():
+    """
+    Get the daemon socket path inside a directory only this user can access
+
+    Returns:
+        str or None if no such directory is available
+    """
+    import stat
+    import tempfile
+
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if not runtime_dir:
+        # The temp dir is world-writable, so keep the socket in a 0700 subdirectory
+        runtime_dir = os.path.join(tempfile.gettempdir(), f"cc-notify-{os.getuid()}")
+        try:
+            os.mkdir(runtime_dir, 0o700)
+        except FileExistsError:
+            pass
+        except OSError:
+            return None
+
+    # Refuse directories (or symlinks) that another user could have planted
+    try:
+        st = os.lstat(runtime_dir)
+    except OSError:
+        return None
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        return None
+    return os.path.join(runtime_dir, "cc-notify.sock")
+
+
+def _is_own_socket(path):
+    """Check that path is a socket owned by the current user"""
+    import stat
+
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid()
+
+
+def _send_to_daemon(notification_type, message):
+    """
+    Send a notification to the running daemon
+
+    Returns:
+        str: "sent", "absent" if no daemon is listening, or "failed" if a
+        daemon exists but could not take the message (busy, too large)
+    """
+    import errno
+    import socket
+
+    path = _daemon_socket_path()
+    if not os.path.lexists(path):
+        return "absent"
+    if not _is_own_socket(path):
+        return "failed"
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    # Never wait on a busy daemon: a full queue raises instead of blocking the hook
+    sock.setblocking(False)
+    try:
+        payload = f"{notification_type}\0{message}".encode("utf-8", "replace")
+        sock.sendto(payload, path)
+        return "sent"
+    except OSError as e:
+        # A leftover socket file with nobody bound to it refuses the datagram
+        if e.errno in (errno.ECONNREFUSED, errno.ENOENT):
+            return "absent"
+        return "failed"
+    finally:
+        sock.close()
+
+
+def _spawn_daemon():
+    """Start the notification daemon detached from the hook process"""
+    import subprocess
+
+    # The daemon displays notifications itself, so it must not forward them
+    env = dict(os.environ)
+    env.pop(_DAEMON_ENV, None)
+
+    try:
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), _DAEMON_ARG],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=True,
+            start_new_session=True,
+            env=env
+        )
+    except Exception as e:
+        print(f"[WARNING] Could not start notification daemon: {e}")
+
+
+def _bind_daemon_socket(path):
+    """
+    Bind the daemon socket, replacing a stale file left by a dead daemon
+
+    Returns:
+        socket or None if another daemon is already listening or the
+        existing file does not belong to this user
+    """
+    import socket
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    # Owner-only permissions so other users cannot inject notifications
+    old_umask = os.umask(0o177)
+    try:
+        try:
+            sock.bind(path)
+        except OSError:
+            # Never talk to or remove a file this user does not own
+            if not _is_own_socket(path):
+                sock.close()
+                return None
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            try:
+                probe.connect(path)
+                sock.close()
+                return None
+            except OSError:
+                pass
+            finally:
+                probe.close()
+            os.unlink(path)
+            sock.bind(path)
+    except OSError:
+        sock.close()
+        return None
+    finally:
+        os.umask(old_umask)
+    return sock
+
+
+def _show_coalesced(events):
+    """Display queued events, folding a burst into a single notification"""
+    if len(events) == 1:
+        show_notification(*events[0])
+        return
+
+    # Keep errors visible: report the latest error, otherwise the latest event
+    errors = [event for event in events if event[0] == "error"]
+    ntype, message = errors[-1] if errors else events[-1]
+    show_notification(ntype, f"{message} (+{len(events) - 1} more)")
+
+
+def _decode_event(data):
+    """Split a daemon datagram back into (notification_type, message)"""
+    ntype, _, message = data.decode("utf-8", "replace").partition("\0")
+    return (ntype, message)
+
+
+def _unlink_daemon_socket(path, inode):
+    """Remove the socket file, unless another daemon has since replaced it"""
+    try:
+        if os.stat(path).st_ino == inode:
+            os.unlink(path)
+    except OSError:
+        pass
+
+
+def _exit_on_signal(signum, frame):
+    """Turn SIGTERM into SystemExit so the daemon's cleanup still runs"""
+    raise SystemExit(0)
+
+
+def _run_daemon():
+    """Serve notifications from the socket until idle, coalescing bursts"""
+    import signal
+    import socket
+    import time
+
+    path = _daemon_socket_path()
+    sock = _bind_daemon_socket(path) if path else None
+    if sock is None:
+        return
+    inode = os.stat(path).st_ino
+    signal.signal(signal.SIGTERM, _exit_on_signal)
+
+    pending = []
+    flush_at = 0.0
+    try:
+        while True:
+            if pending:
+                remaining = flush_at - time.monotonic()
+                if remaining <= 0:
+                    _show_coalesced(pending)
+                    pending = []
+                    continue
+                sock.settimeout(remaining)
+            else:
+                sock.settimeout(_DAEMON_IDLE_SECONDS)
+
+            try:
+                data = sock.recv(65536)
+            except socket.timeout:
+                if pending:
+                    continue
+                break
+
+            if not pending:
+                flush_at = time.monotonic() + _DAEMON_COALESCE_SECONDS
+            pending.append(_decode_event(data))
+
+        # Idle: stop new hooks from reaching us, then show anything sent
+        # before the socket file disappeared
+        _unlink_daemon_socket(path, inode)
+        sock.setblocking(False)
+        while True:
+            try:
+                pending.append(_decode_event(sock.recv(65536)))
+            except OSError:
+                break
+        if pending:
+            _show_coalesced(pending)
+    finally:
+        sock.close()
+        _unlink_daemon_socket(path, inode)
+
+
 def parse_stdin_json():
     """Parse JSON input from stdin (sent by Claude Code hooks)"""
     try:
         if sys.stdin.isatty():
             return None
-        raw = sys.stdin.read()
+        # Read raw bytes; both parsers accept them without a str decode step
+        raw = sys.stdin.buffer.read()
         if not raw.strip():
             return None
-        return json.loads(raw)
-    except json.JSONDecodeError:
+        # Imported here so legacy argument mode never loads a JSON parser;
+        # prefer orjson when installed and fall back to the stdlib
+        try:
+            from orjson import loads
+        except ImportError:
+            from json import loads
+        return loads(raw)
+    except ValueError:
+        # Both json and orjson decode errors are ValueError subclasses
         return None
     except Exception:
         return None
 
 
+def _basename(file_path):
+    """Return the final path component, accepting both / and \\ separators"""
+    return file_path.rstrip("/\\").rsplit("/", 1)[-1].rsplit("\\", 1)[-1]
+
+
+# Results that never depend on the hook payload
+_STOP_RESULT = ("info", "Task Complete", "Claude has finished responding")
+_SUBTASK_DONE_RESULT = ("info", "Subtask Done", "A subtask has completed")
+
+
+def _on_session_start(data):
+    """Describe a SessionStart event"""
+    source = data.get("source", "startup")
+    return ("info", "Session Started", f"Session {source}")
+
+
+def _on_stop(data):
+    """Describe a Stop event"""
+    return _STOP_RESULT
+
+
+def _pre_write(data):
+    """Describe a file about to be written or edited"""
+    file_path = data.get("tool_input", {}).get("file_path", "unknown")
+    filename = _basename(file_path) if file_path else "unknown"
+    return ("info", f"Writing: {filename}", f"Modifying {filename}")
+
+
+def _pre_bash(data):
+    """Describe a shell command about to run"""
+    cmd = data.get("tool_input", {}).get("command", "")
+    short_cmd = cmd[:50] + ("..." if cmd[50:51] else "")
+    return ("info", "Running Command", short_cmd)
+
+
+def _pre_task(data):
+    """Describe a subtask about to be spawned"""
+    desc = data.get("tool_input", {}).get("description", "subtask")
+    return ("info", "Spawning Task", desc[:60])
+
+
+def _pre_default(data):
+    """Describe any other tool about to be used"""
+    tool_name = data.get("tool_name", "")
+    return ("info", f"Tool: {tool_name}", f"Using {tool_name}")
+
+
+_PRE_TOOL_HANDLERS = {
+    "Write": _pre_write,
+    "Edit": _pre_write,
+    "Bash": _pre_bash,
+    "Task": _pre_task,
+}
+
+
+def _on_pre_tool_use(data):
+    """Dispatch a PreToolUse event on its tool name"""
+    handler = _PRE_TOOL_HANDLERS.get(data.get("tool_name", ""), _pre_default)
+    return handler(data)
+
+
+def _post_write(data):
+    """Describe the outcome of a file write or edit"""
+    file_path = data.get("tool_input", {}).get("file_path", "")
+    filename = _basename(file_path) if file_path else "file"
+    success = data.get("tool_response", {}).get("success", True)
+    status = "saved" if success else "failed"
+    return ("info", f"File {status}", filename)
+
+
+def _post_task(data):
+    """Describe a finished subtask"""
+    return _SUBTASK_DONE_RESULT
+
+
+def _post_default(data):
+    """Describe any other tool that has completed"""
+    tool_name = data.get("tool_name", "")
+    return ("info", f"{tool_name} Done", f"{tool_name} completed")
+
+
+_POST_TOOL_HANDLERS = {
+    "Write": _post_write,
+    "Edit": _post_write,
+    "Task": _post_task,
+}
+
+
+def _on_post_tool_use(data):
+    """Dispatch a PostToolUse event on its tool name"""
+    handler = _POST_TOOL_HANDLERS.get(data.get("tool_name", ""), _post_default)
+    return handler(data)
+
+
+def _on_post_tool_use_failure(data):
+    """Describe a failed tool call"""
+    error = data.get("error", "")
+    short_err = error[:80] if error else "Unknown error"
+    return ("error", f"{data.get('tool_name', '')} Failed", short_err)
+
+
+def _on_notification(data):
+    """Pass through a Notification event"""
+    ntype = data.get("notification_type", "info")
+    msg = data.get("message", "Notification")
+    return (ntype, _DEFAULT_TITLE, msg[:100])
+
+
+def _on_subagent_start(data):
+    """Describe a SubagentStart event"""
+    agent_type = data.get("agent_type", "Agent")
+    return ("info", "Agent Started", f"{agent_type} spawned")
+
+
+def _on_subagent_stop(data):
+    """Describe a SubagentStop event"""
+    agent_type = data.get("agent_type", "Agent")
+    return ("info", "Agent Stopped", f"{agent_type} finished")
+
+
+def _on_session_end(data):
+    """Describe a SessionEnd event"""
+    reason = data.get("reason", "ended")
+    return ("info", "Session Ended", f"Reason: {reason}")
+
+
+def _on_default(data):
+    """Describe an unrecognised hook event"""
+    return ("info", _DEFAULT_TITLE, data.get("hook_event_name", "") or "Hook triggered")
+
+
+# Map hook event names to their message handlers
+_EVENT_HANDLERS = {
+    "SessionStart": _on_session_start,
+    "Stop": _on_stop,
+    "PreToolUse": _on_pre_tool_use,
+    "PostToolUse": _on_post_tool_use,
+    "PostToolUseFailure": _on_post_tool_use_failure,
+    "Notification": _on_notification,
+    "SubagentStart": _on_subagent_start,
+    "SubagentStop": _on_subagent_stop,
+    "SessionEnd": _on_session_end,
+}
+
+
 def generate_message_from_hook(data):
     """
     Generate notification message based on hook event data
@@ -207,78 +695,22 @@ def generate_message_from_hook(data):
     Returns:
         tuple: (notification_type, title, message)
     """
-    event_name = data.get("hook_event_name", "")
-    tool_name = data.get("tool_name", "")
-    tool_input = data.get("tool_input", {})
-    tool_response = data.get("tool_response", {})
-    error = data.get("error", "")
-
-    # SessionStart
-    if event_name == "SessionStart":
-        source = data.get("source", "startup")
-        return ("info", "Session Started", f"Session {source}")
-
-    # Stop
-    if event_name == "Stop":
-        return ("info", "Task Complete", "Claude has finished responding")
-
-    # PreToolUse
-    if event_name == "PreToolUse":
-        if tool_name in ("Write", "Edit"):
-            file_path = tool_input.get("file_path", "unknown")
-            filename = Path(file_path).name if file_path else "unknown"
-            return ("info", f"Writing: {filename}", f"Modifying {filename}")
-        if tool_name == "Bash":
-            cmd = tool_input.get("command", "")
-            short_cmd = cmd[:50] + "..." if len(cmd) > 50 else cmd
-            return ("info", "Running Command", short_cmd)
-        if tool_name == "Task":
-            desc = tool_input.get("description", "subtask")
-            return ("info", "Spawning Task", desc[:60])
-        return ("info", f"Tool: {tool_name}", f"Using {tool_name}")
-
-    # PostToolUse
-    if event_name == "PostToolUse":
-        if tool_name in ("Write", "Edit"):
-            file_path = tool_input.get("file_path", "")
-            filename = Path(file_path).name if file_path else "file"
-            success = tool_response.get("success", True)
-            status = "saved" if success else "failed"
-            return ("info", f"File {status}", filename)
-        if tool_name == "Task":
-            return ("info", "Subtask Done", "A subtask has completed")
-        return ("info", f"{tool_name} Done", f"{tool_name} completed")
-
-    # PostToolUseFailure
-    if event_name == "PostToolUseFailure":
-        short_err = error[:80] if error else "Unknown error"
-        return ("error", f"{tool_name} Failed", short_err)
-
-    # Notification
-    if event_name == "Notification":
-        ntype = data.get("notification_type", "info")
-        msg = data.get("message", "Notification")
-        return (ntype, "Claude Code", msg[:100])
-
-    # SubagentStart / SubagentStop
-    if event_name == "SubagentStart":
-        agent_type = data.get("agent_type", "Agent")
-        return ("info", "Agent Started", f"{agent_type} spawned")
-    if event_name == "SubagentStop":
-        agent_type = data.get("agent_type", "Agent")
-        return ("info", "Agent Stopped", f"{agent_type} finished")
-
-    # SessionEnd
-    if event_name == "SessionEnd":
-        reason = data.get("reason", "ended")
-        return ("info", "Session Ended", f"Reason: {reason}")
-
-    # Default fallback
-    return ("info", "Claude Code", event_name or "Hook triggered")
+    handler = _EVENT_HANDLERS.get(data.get("hook_event_name", ""), _on_default)
+    return handler(data)
 
 
 def main():
     """Main entry point for the notification script"""
+    # Detached child spawned by notify_windows()
+    if len(sys.argv) == 5 and sys.argv[1] == _TOAST_CHILD_ARG:
+        success = _show_windows_toast(sys.argv[2], sys.argv[3], sys.argv[4] or None)
+        sys.exit(0 if success else 1)
+
+    # Background daemon spawned by show_notification()
+    if len(sys.argv) == 2 and sys.argv[1] == _DAEMON_ARG:
+        _run_daemon()
+        sys.exit(0)
+
     # Check for stdin JSON first (hook mode)
     hook_data = parse_stdin_json()
 